@@ -1,9 +1,4 @@
-import operator
-
-try:
-    from collections.abc import Mapping
-except ImportError:
-    from collections import Mapping
+from collections.abc import Mapping
 
 __all__ = ['assert_dict_is_subset', 'assert_model_attrs']
 
@@ -26,7 +21,7 @@ def assert_dict_is_subset(subset, superset, recursive=True):
      ...
     AssertionError
     """
-    superset_slice = _slice_superset(subset, superset, recursive=recursive)
+    superset_slice = _slice_superset_dict(subset, superset, recursive=recursive)
 
     expected = subset
     actual = superset_slice
@@ -42,39 +37,98 @@ def assert_model_attrs(instance, _d=UNSET, **attrs):
         else:
             attrs = _d
 
-    model_attrs_slice = _slice_superset(attrs, instance,
-                                        getitem=getattr, hasitem=hasattr)
+    model_attrs_slice = _slice_superset_attr(attrs, instance)
 
     expected = attrs
     actual = model_attrs_slice
-    assert_dict_is_subset(expected, actual)
+    assert expected == actual
+
 
+def _slice_superset_dict(subset, superset, recursive=True):
+    """Select the items of `superset` with keys in `subset`
+
+    Nested mappings are sliced from an explicit stack, rather than through
+    recursive calls.
+    """
+    if not recursive or not _has_mapping_values(subset):
+        return {key: superset[key] for key in subset if key in superset}
+
+    superset_slice = {}
+    pending = [(subset, superset, superset_slice)]
+
+    while pending:
+        subset_node, superset_node, slice_node = pending.pop()
+
+        for key, value in subset_node.items():
+            if key not in superset_node:
+                continue
+
+            superset_value = superset_node[key]
+            if isinstance(value, (dict, Mapping)) and _is_bare_mapping(superset_value):
+                # NOTE: value *must* have .items(), superset_value only needs
+                #       `b in a` and `a[b]`
+                nested_slice = slice_node[key] = {}
+                pending.append((value, superset_value, nested_slice))
+            else:
+                slice_node[key] = superset_value
+
+    return superset_slice
+
+
+def _slice_superset_attr(subset, instance):
+    """Select the attrs of `instance` named in `subset`
+
+    Mapping values nested beneath the attrs are sliced by key, as with
+    _slice_superset_dict.
+    """
+    if not _has_mapping_values(subset):
+        return {key: getattr(instance, key) for key in subset if hasattr(instance, key)}
 
-def _slice_superset(subset, superset,
-                    recursive=True,
-                    getitem=operator.getitem,
-                    hasitem=operator.contains):
     superset_slice = {}
 
     for key, value in subset.items():
-        if not hasitem(superset, key):
+        if not hasattr(instance, key):
             continue
 
-        superset_value = getitem(superset, key)
-        if recursive and (isinstance(value, Mapping) and
-                          _is_bare_mapping(superset_value)):
-            # NOTE: value *must* have .items(), superset_value only needs
-            #       `b in a` and `a[b]`
-            superset_value = _slice_superset(value, superset_value)
+        superset_value = getattr(instance, key)
+        if isinstance(value, (dict, Mapping)) and _is_bare_mapping(superset_value):
+            superset_value = _slice_superset_dict(value, superset_value)
 
         superset_slice[key] = superset_value
 
     return superset_slice
 
 
+def _has_mapping_values(d):
+    """Whether any of the dict's values may need to be sliced recursively"""
+    for value in d.values():
+        if isinstance(value, (dict, Mapping)):
+            return True
+    return False
+
+
 def _is_bare_mapping(o):
     """Whether the object supports __getitem__ and __contains__"""
+    if isinstance(o, dict):
+        return True
+
+    mro = type(o).__mro__
     return (
-        hasattr(o, '__contains__') and callable(o.__contains__) and
-        hasattr(o, '__getitem__') and callable(o.__getitem__)
+        _lookup_special(mro, '__contains__') is not None and
+        _lookup_special(mro, '__getitem__') is not None
     )
+
+
+def _lookup_special(mro, name):
+    """Find a special method the way `in` and `[]` do, returning None if it's missing
+
+    A method set to None (the convention for disabling it) is returned as
+    such, so it reads as missing. Only the type's MRO is searched. A getattr() on the type would also find
+    methods of its metaclass (e.g. EnumMeta.__contains__), which don't apply
+    to instances.
+    """
+    for klass in mro:
+        namespace = vars(klass)
+        if name in namespace:
+            return namespace[name]
+    return None
@@ -1,18 +1,17 @@
 import functools
-import inspect
 import typing
+import weakref
+from collections import Counter
+from collections.abc import Collection as BaseCollection
+from types import GeneratorType
 
 from .assertions import assert_model_attrs
 
-try:
-    from collections.abc import Collection as BaseCollection
-except ImportError:
-    from collections import Collection as BaseCollection
-
-try:
-    from typing import Protocol
-except ImportError:
-    from typing_extensions import Protocol
+if typing.TYPE_CHECKING:
+    try:
+        from typing import Protocol
+    except ImportError:
+        from typing_extensions import Protocol
 
 __all__ = [
     'Any',
@@ -28,6 +27,12 @@ __all__ = [
 
 T = typing.TypeVar('T')
 
+_MISSING = object()
+
+#: Builtin types whose equal values are interchangeable, unlike meta-values (e.g.
+#: Optional(5) == None) and floats (0.0 == -0.0, but their reprs differ)
+_EXACT_TYPES = frozenset({str, bytes, int, bool, type(None)})
+
 _CheckerType = typing.TypeVar('_CheckerType', bound=typing.Type['_BaseCollectionValuesChecker'])
 _ItemType = typing.TypeVar('_ItemType')
 
@@ -52,25 +57,29 @@ class Any:
     False
     """
 
+    __slots__ = ('allowed_types',)
+
     def __init__(self, *allowed_types):
         self.allowed_types = allowed_types
 
     def __eq__(self, other):
-        if self.allowed_types:
-            return isinstance(other, self.allowed_types)
-        else:
-            return True
+        allowed_types = self.allowed_types
+        return isinstance(other, allowed_types) if allowed_types else True
 
     def __repr__(self):
         if not self.allowed_types:
             return '<Any>'
         else:
-            return f'<Any {", ".join(t.__name__ for t in self.allowed_types)}>'
+            return f'<Any {", ".join([t.__name__ for t in self.allowed_types])}>'
 
     def __hash__(self):
         return hash(self.allowed_types)
 
 
+#: Shared Any() instance, used as the expected value of bare keys passed to Dict methods
+_ANY = Any()
+
+
 class Optional:
     """Meta-value which compares True to None or the optionally specified value
 
@@ -93,11 +102,14 @@ class Optional:
     False
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value=None):
         self.value = value
 
     def __eq__(self, other):
-        return other in (None, self.value)
+        value = self.value
+        return other is None or other is value or value == other
 
     def __hash__(self):
         return hash(self.value)
@@ -110,74 +122,136 @@ class _CollectionValuesCheckerMeta(type(BaseCollection)):
     def __hash__(cls):
         return hash(id(cls))
 
-    def __eq__(cls: typing.Type['_BaseCollectionValuesChecker'], instance) -> bool:
-        return cls.__instancecheck__(instance)
-
     def __instancecheck__(cls: typing.Type['_BaseCollectionValuesChecker'], instance) -> bool:
-        if cls._collection_type and not isinstance(instance, cls._collection_type):
+        collection_type = cls._collection_type
+        if collection_type and not isinstance(instance, collection_type):
             return False
 
-        if cls._must_be_empty and not cls._collection_is_empty_(instance):
-            return False
+        (must_contain, must_contain_only, must_contain_exactly, must_not_contain,
+         must_be_empty, must_not_be_empty) = cls._state
 
-        if cls._must_not_be_empty and cls._collection_is_empty_(instance):
-            return False
 
-        if cls._must_contain and not all(cls._collection_contains_(instance, v) for v in cls._must_contain):
+        if must_be_empty or must_not_be_empty:
+            is_empty = cls._collection_is_empty_(instance)
+            if must_be_empty and not is_empty:
+                return False
+            if must_not_be_empty and is_empty:
+                return False
+
+        if must_contain_exactly and len(instance) != len(must_contain_exactly):
             return False
 
-        if cls._must_contain_only and not all(v in cls._must_contain_only for v in cls._collection_iter_(instance)):
+        if must_contain and not cls._collection_contains_all_(instance, must_contain):
             return False
 
-        if cls._must_contain_exactly:
-            values = list(cls._collection_iter_(instance))
-            if len(cls._must_contain_exactly) != len(values):
-                return False
-            for v in cls._must_contain_exactly:
-                try:
-                    values.remove(v)
-                except ValueError:
+        if must_not_contain:
+            contains = cls._collection_contains_
+            for v in must_not_contain:
+                if contains(instance, v):
                     return False
 
-        if cls._must_not_contain and any(cls._collection_contains_(instance, v) for v in cls._must_not_contain):
+        if must_contain_only and not cls._collection_contains_only_(instance, must_contain_only):
+            return False
+
+        if must_contain_exactly and not cls._collection_contains_exactly_(instance, must_contain_exactly):
             return False
 
         return True
 
+    __eq__ = __instancecheck__
+
     def __repr__(cls: typing.Type['_BaseCollectionValuesChecker']) -> str:
+        # cls.__dict__ is used so a parent's cached repr isn't inherited
+        cached_repr = cls.__dict__.get('_cached_repr')
+        if cached_repr is not None:
+            return cached_repr
+
+        state = cls._state
         parts = [cls.__name__]
 
-        if cls._must_be_empty:
+        if state.must_be_empty:
             parts.append('empty()')
 
-        if cls._must_not_be_empty:
+        if state.must_not_be_empty:
             parts.append('not_empty()')
 
-        if cls._must_contain:
-            parts.append(f'containing({cls._repr_containing_(cls._must_contain)})')
+        if state.must_contain:
+            parts.append(f'containing({cls._repr_containing_(state.must_contain)})')
 
-        if cls._must_contain_only:
-            parts.append(f'containing_only({cls._repr_containing_only_(cls._must_contain_only)})')
+        if state.must_contain_only:
+            parts.append(f'containing_only({cls._repr_containing_only_(state.must_contain_only)})')
 
-        if cls._must_contain_exactly:
-            parts.append(f'containing_exactly({cls._repr_containing_exactly_(cls._must_contain_exactly)})')
+        if state.must_contain_exactly:
+            parts.append(f'containing_exactly({cls._repr_containing_exactly_(state.must_contain_exactly)})')
 
-        if cls._must_not_contain:
-            parts.append(f'not_containing({cls._repr_not_containing_(cls._must_not_contain)})')
+        if state.must_not_contain:
+            parts.append(f'not_containing({cls._repr_not_containing_(state.must_not_contain)})')
 
-        return '.'.join(parts)
+        cls._cached_repr = '.'.join(parts)
+        return cls._cached_repr
 
 
-class _GenerativeMethod(Protocol):
-    def __call__(cls: _CheckerType, *args, **kwargs) -> _CheckerType: ...
+if typing.TYPE_CHECKING:
+    class _GenerativeMethod(Protocol):
+        def __call__(cls: _CheckerType, *args, **kwargs) -> _CheckerType: ...
 
 
-def _generative(fn: _GenerativeMethod) -> _GenerativeMethod:
+class _CheckerState(typing.NamedTuple):
+    """The constraints of a collection values checker class"""
+    must_contain: typing.Tuple[typing.Any, ...] = ()
+    must_contain_only: typing.Tuple[typing.Any, ...] = ()
+    must_contain_exactly: typing.Tuple[typing.Any, ...] = ()
+    must_not_contain: typing.Tuple[typing.Any, ...] = ()
+    must_be_empty: bool = False
+    must_not_be_empty: bool = False
+
+
+#: Generated checker classes, keyed by their originating class and constraints
+_generated_checkers: 'weakref.WeakValueDictionary[tuple, typing.Type[_BaseCollectionValuesChecker]]' = \
+    weakref.WeakValueDictionary()
+
+
+def _constraint_cache_key(value) -> typing.Hashable:
+    """Key a constraint value for the generated checker cache
+
+    Values of exact builtin types are keyed by type and value, so 1 and True
+    don't share a checker. Any others (e.g. meta-values, which compare equal
+    to values they don't behave like) are keyed by identity; the cached
+    checker's state keeps them alive, so their ids can't be reused.
+    """
+    value_type = type(value)
+    if value_type is tuple:
+        return tuple, tuple(_constraint_cache_key(v) for v in value)
+    elif value_type in _EXACT_TYPES:
+        return value_type, value
+
+    return value_type, id(value)
+
+
+def _generative(fn: typing.Callable[..., typing.Dict[str, typing.Any]]) -> '_GenerativeMethod':
+    """Turn a method returning updated constraints into one returning a new checker class
+
+    Generated classes always derive directly from the checker class they
+    originated from (e.g. List), carrying all their constraints in a single
+    _CheckerState. This way, long chains don't build ever-deeper MROs, and
+    each step costs a single type() call.
+
+    Checkers with identical constraints are only generated once.
+    """
 
     @functools.wraps(fn)
     def wrapped(cls: _CheckerType, *args, **kwargs) -> _CheckerType:
-        clone = typing.cast(_CheckerType, type(cls.__name__, (cls,), {}))
-        fn(clone, *args, **kwargs)
+        state = cls._state._replace(**fn(cls, *args, **kwargs))
+        base = cls._checker_base
+        namespace = {'_state': state, '_checker_base': base}
+
+        cache_key = (base, tuple(_constraint_cache_key(v) for v in state))
+        try:
+            return _generated_checkers[cache_key]
+        except KeyError:
+            pass
+
+        clone = _generated_checkers[cache_key] = type(cls.__name__, (base,), namespace)
         return clone
 
     return wrapped
@@ -185,15 +259,21 @@ def _generative(fn: _GenerativeMethod) -> _GenerativeMethod:
 
 class _BaseCollectionValuesChecker(typing.Generic[_ItemType]):
     _collection_type: typing.Type[BaseCollection] = None
-    _must_contain: typing.Tuple[_ItemType, ...] = ()
-    _must_contain_only: typing.Tuple[_ItemType, ...] = ()
-    _must_contain_exactly: typing.Tuple[_ItemType, ...] = ()
-    _must_not_contain: typing.Tuple[_ItemType, ...] = ()
-    _must_be_empty: bool = False
-    _must_not_be_empty: bool = False
+    _checker_base: typing.Type['_BaseCollectionValuesChecker'] = None
+    _state: _CheckerState = _CheckerState()
+    _must_contain_only_set: typing.Optional[typing.FrozenSet[_ItemType]] = None
 
     def __init_subclass__(cls, **kwargs):
-        cls._collection_type = next((base for base in reversed(cls.__mro__) if issubclass(base, BaseCollection)), None)
+        if cls._collection_type is None:
+            cls._collection_type = next((base for base in reversed(cls.__mro__) if issubclass(base, BaseCollection)), None)
+        if '_checker_base' not in cls.__dict__:
+            cls._checker_base = cls
+
+        if cls._state.must_contain_only:
+            try:
+                cls._must_contain_only_set = frozenset(cls._state.must_contain_only)
+            except TypeError:
+                cls._must_contain_only_set = None
 
     @classmethod
     def _process_items(cls, items) -> typing.Iterable[_ItemType]:
@@ -201,45 +281,52 @@ class _BaseCollectionValuesChecker(typing.Generic[_ItemType]):
 
     @classmethod
     def _unpack_generators(cls, items) -> typing.Iterable[_ItemType]:
-        for item in items:
-            if inspect.isgenerator(item):
-                yield from item
-            else:
-                yield item
+        if GeneratorType not in map(type, items):
+            return items
+
+        return [
+            value
+            for item in items
+            for value in (item if type(item) is GeneratorType else (item,))
+        ]
 
     @classmethod
     @_generative
     def containing(cls, *items):
-        cls._must_contain += tuple(cls._process_items(items))
+        return {'must_contain': cls._unique_items_(cls._state.must_contain + tuple(cls._process_items(items)))}
 
     @classmethod
     @_generative
     def containing_only(cls, *items):
-        cls._must_contain_only += tuple(cls._process_items(items))
+        return {'must_contain_only': cls._unique_items_(cls._state.must_contain_only + tuple(cls._process_items(items)))}
 
     @classmethod
     @_generative
     def containing_exactly(cls, *items):
-        cls._must_contain_exactly += tuple(cls._process_items(items))
+        return {'must_contain_exactly': cls._state.must_contain_exactly + tuple(cls._process_items(items))}
 
     @classmethod
     @_generative
     def not_containing(cls, *items):
-        cls._must_not_contain += tuple(cls._process_items(items))
+        return {'must_not_contain': cls._unique_items_(cls._state.must_not_contain + tuple(cls._process_items(items)))}
 
     @classmethod
     @_generative
     def empty(cls):
-        cls._must_be_empty = True
+        return {'must_be_empty': True}
 
     @classmethod
     @_generative
     def not_empty(cls):
-        cls._must_not_be_empty = True
+        return {'must_not_be_empty': True}
+
+    @classmethod
+    def _unique_items_(cls, items: typing.Tuple[_ItemType, ...]) -> typing.Tuple[_ItemType, ...]:
+        return items
 
     @classmethod
     def _repr_containing_(cls, must_contain):
-        return ', '.join(repr(item) for item in must_contain)
+        return ', '.join([repr(item) for item in must_contain])
 
     @classmethod
     def _repr_containing_only_(cls, must_contain_only):
@@ -255,6 +342,7 @@ class _BaseCollectionValuesChecker(typing.Generic[_ItemType]):
 
     @classmethod
     def _collection_is_empty_(cls, collection) -> bool:
+        # Not truthiness, as some collections (e.g. numpy arrays) have element-wise __bool__
         return len(collection) == 0
 
     @classmethod
@@ -265,9 +353,83 @@ class _BaseCollectionValuesChecker(typing.Generic[_ItemType]):
     def _collection_iter_(cls, collection) -> typing.Iterable[_ItemType]:
         return collection
 
+    @classmethod
+    def _collection_contains_all_(cls, collection, must_contain: typing.Tuple[_ItemType, ...]) -> bool:
+        contains = cls._collection_contains_
+        for v in must_contain:
+            if not contains(collection, v):
+                return False
+        return True
+
+    @classmethod
+    def _collection_contains_only_(cls, collection, must_contain_only: typing.Tuple[_ItemType, ...]) -> bool:
+        must_contain_only_set = cls._must_contain_only_set
+        if must_contain_only is not cls._state.must_contain_only:
+            must_contain_only_set = None
+
+        for v in cls._collection_iter_(collection):
+            # Meta-values (e.g. Any()) don't hash the same as the values they compare
+            # equal to, so only a hit in the set is conclusive
+            if must_contain_only_set is not None:
+                try:
+                    if v in must_contain_only_set:
+                        continue
+                except TypeError:
+                    pass
+
+            if v not in must_contain_only:
+                return False
+
+        return True
+
+    @classmethod
+    def _collection_contains_exactly_(cls, collection, must_contain_exactly: typing.Tuple[_ItemType, ...]) -> bool:
+        # Hashable values may be compared as multisets in linear time. As with
+        # containing_only, only a match is conclusive.
+        try:
+            if Counter(cls._collection_iter_(collection)) == Counter(must_contain_exactly):
+                return True
+        except TypeError:
+            pass
+
+        values = list(cls._collection_iter_(collection))
+        for v in must_contain_exactly:
+            try:
+                values.remove(v)
+            except ValueError:
+                return False
+
+        return not values
+
+
+def _has_default_contains(cls: typing.Type[_BaseCollectionValuesChecker]) -> bool:
+    """Whether the checker class tests membership with a plain `in`"""
+    return cls._collection_contains_.__func__ is _BaseCollectionValuesChecker._collection_contains_.__func__
+
+
+def _drop_implied_substrings(values: typing.Tuple[typing.Any, ...]) -> typing.Tuple[typing.Any, ...]:
+    """Remove strings which are substrings of other strings in `values`
+
+    Any string containing 'apple' also contains 'app', so only the former
+    need be searched for.
+    """
+    strs = [v for v in values if isinstance(v, str)]
+    return tuple(
+        v
+        for v in values
+        if not isinstance(v, str) or not any(v != other and v in other for other in strs)
+    )
+
 
 class _CollectionValuesChecker(_BaseCollectionValuesChecker[typing.Any]):
-    pass
+    @classmethod
+    def _unique_items_(cls, items: typing.Tuple[typing.Any, ...]) -> typing.Tuple[typing.Any, ...]:
+        # Only exact builtin values are deduped, as meta-values may compare (and hash)
+        # equal to values they aren't redundant with
+        if not all(type(item) in _EXACT_TYPES for item in items):
+            return items
+
+        return tuple({(type(item), item): item for item in items}.values())
 
 
 class _DictValuesChecker(_BaseCollectionValuesChecker[typing.Tuple[typing.Hashable, typing.Any]]):
@@ -275,14 +437,12 @@ class _DictValuesChecker(_BaseCollectionValuesChecker[typing.Tuple[typing.Hashab
     def _process_items(
         cls,
         items: typing.Union[typing.Hashable, typing.Dict],
-    ) -> typing.List[typing.Tuple[typing.Hashable, typing.Any]]:
-        processed = []
+    ) -> typing.Iterable[typing.Tuple[typing.Hashable, typing.Any]]:
         for item in cls._unpack_generators(items):
             if isinstance(item, dict):
-                processed.extend(item.items())
+                yield from item.items()
             else:
-                processed.append((item, Any()))
-        return processed
+                yield item, _ANY
 
     @classmethod
     def containing(cls: T, *items, **kwargs) -> T:
@@ -307,6 +467,11 @@ class _DictValuesChecker(_BaseCollectionValuesChecker[typing.Tuple[typing.Hashab
     @classmethod
     def _collection_contains_(cls, collection, v) -> bool:
         k, v = v
+        # Subclasses may override __contains__/__getitem__ without touching get()
+        if type(collection) is dict:
+            actual = collection.get(k, _MISSING)
+            return actual is not _MISSING and actual == v
+
         return k in collection and collection[k] == v
 
     @classmethod
@@ -334,6 +499,8 @@ class Collection(_CollectionValuesChecker, BaseCollection, metaclass=_Collection
     False
     """
 
+    _collection_type = BaseCollection
+
 
 class List(_CollectionValuesChecker, list, metaclass=_CollectionValuesCheckerMeta):
     """Special class enabling equality comparisons to check items in a list
@@ -381,6 +548,8 @@ class List(_CollectionValuesChecker, list, metaclass=_CollectionValuesCheckerMet
     False
     """
 
+    _collection_type = list
+
 
 class Set(_CollectionValuesChecker, set, metaclass=_CollectionValuesCheckerMeta):
     """Special class enabling equality comparisons to check items in a set
@@ -408,6 +577,28 @@ class Set(_CollectionValuesChecker, set, metaclass=_CollectionValuesCheckerMeta)
     False
     """
 
+    _collection_type = set
+    _must_contain_set: typing.Optional[typing.FrozenSet[typing.Any]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # As in _unique_items_, meta-values mustn't be merged with equal values
+        must_contain = cls._state.must_contain
+        if _has_default_contains(cls) and all(type(v) in _EXACT_TYPES for v in must_contain):
+            cls._must_contain_set = frozenset(must_contain)
+        else:
+            cls._must_contain_set = None
+
+    @classmethod
+    def _collection_contains_all_(cls, collection, must_contain: typing.Tuple[typing.Any, ...]) -> bool:
+        # issubset() bypasses the __contains__ of set subclasses
+        must_contain_set = cls._must_contain_set
+        if must_contain_set is not None and must_contain is cls._state.must_contain and type(collection) is set:
+            return must_contain_set.issubset(collection)
+
+        return super()._collection_contains_all_(collection, must_contain)
+
 
 class Dict(_DictValuesChecker, dict, metaclass=_CollectionValuesCheckerMeta):
     """Special class enabling equality comparisons to check items in a dict
@@ -452,6 +643,8 @@ class Dict(_DictValuesChecker, dict, metaclass=_CollectionValuesCheckerMeta):
 
     """
 
+    _collection_type = dict
+
 
 class Str(_CollectionValuesChecker, str, metaclass=_CollectionValuesCheckerMeta):
     """Special class enabling equality comparisons to check items in a string
@@ -484,6 +677,24 @@ class Str(_CollectionValuesChecker, str, metaclass=_CollectionValuesCheckerMeta)
 
     """
 
+    _collection_type = str
+    _search_terms: typing.Optional[typing.Tuple[typing.Any, ...]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Implied substrings say nothing about matches of an overridden hook
+        if _has_default_contains(cls):
+            cls._search_terms = _drop_implied_substrings(cls._state.must_contain)
+        else:
+            cls._search_terms = None
+
+    @classmethod
+    def _collection_contains_all_(cls, collection, must_contain: typing.Tuple[typing.Any, ...]) -> bool:
+        if cls._search_terms is not None and must_contain is cls._state.must_contain:
+            must_contain = cls._search_terms
+        return super()._collection_contains_all_(collection, must_contain)
+
 
 class Model:
     """Special class for comparing the equality of attrs of another object
@@ -513,7 +724,7 @@ class Model:
         self.attrs = attrs
 
     def __repr__(self):
-        attrs_repr = ', '.join(f'{k}={v!r}' for k, v in self.attrs.items())
+        attrs_repr = ', '.join([f'{k}={v!r}' for k, v in self.attrs.items()])
         return f'{self.__class__.__name__}({attrs_repr})'
 
     def __eq__(self, other):
@@ -1,3 +1,4 @@
+import enum
 import sys
 
 import pytest
@@ -26,61 +27,112 @@ else:
     from collections import namedtuple
 
 
+class Status(enum.Enum):
+    OK = 'ok'
+
+
+class ContainsDisabled:
+    """Supports `[]`, but explicitly disables `in`"""
+    __contains__ = None
+
+    def __getitem__(self, key):
+        return 'value'
+
+
+#: (expected, actual, recursive) cases where expected is a subset of actual, keyed by test ID
+SUBSET_CASES = {
+    'empty': (
+        {},
+        {},
+        True,
+    ),
+    'non-strict-superset': (
+        {'key': 'value'},
+        {'key': 'value'},
+        True,
+    ),
+    'strict-superset': (
+        {'key': 'value'},
+        {'key': 'value',
+         'other_key': 'other_value'},
+        True,
+    ),
+    'nested-strict-superset': (
+        {'parent': {'key': 'value'}},
+        {'parent': {'key': 'value',
+                    'other_key': 'other_value'}},
+        True,
+    ),
+    'deeply-nested-strict-superset': (
+        {'parent': {'child': {'key': 'value'}},
+         'sibling': {'key': 'value'}},
+        {'parent': {'child': {'key': 'value',
+                              'other_key': 'other_value'},
+                    'other_child': {}},
+         'sibling': {'key': 'value',
+                     'other_key': 'other_value'}},
+        True,
+    ),
+    'non-recursive-nested-equal': (
+        {'parent': {'key': 'value'}},
+        {'parent': {'key': 'value'},
+         'other_key': 'other_value'},
+        False,
+    ),
+}
+
+#: (expected, actual, recursive) cases where expected is not a subset of actual, keyed by test ID
+NON_SUBSET_CASES = {
+    'empty': (
+        {'key': 'value'},
+        {},
+        True,
+    ),
+    'expected-more': (
+        {'key': 'value',
+         'other_key': 'other_value'},
+        {'key': 'value'},
+        True,
+    ),
+    'expected-more-nested': (
+        {'parent': {'key': 'value',
+                    'other_key': 'other_value'}},
+        {'parent': {'key': 'value'}},
+        True,
+    ),
+    'enum-member-for-nested': (
+        {'parent': {'key': 'value'}},
+        {'parent': Status.OK},
+        True,
+    ),
+    'contains-disabled-for-nested': (
+        {'parent': {'key': 'value'}},
+        {'parent': ContainsDisabled()},
+        True,
+    ),
+    'non-recursive-nested-strict-superset': (
+        {'parent': {'key': 'value'}},
+        {'parent': {'key': 'value',
+                    'other_key': 'other_value'}},
+        False,
+    ),
+}
+
+
 class DescribeAssertDictIsSubset:
 
-    @pytest.mark.parametrize('expected, actual', [
-        pytest.param(
-            {},
-            {},
-            id='empty',
-        ),
-        pytest.param(
-            {'key': 'value'},
-            {'key': 'value'},
-            id='non-strict-superset',
-        ),
-        pytest.param(
-            {'key': 'value'},
-            {'key': 'value',
-             'other_key': 'other_value'},
-            id='strict-superset',
-        ),
-        pytest.param(
-            {'parent': {'key': 'value'}},
-            {'parent': {'key': 'value',
-                        'other_key': 'other_value'}},
-            id='nested-strict-superset',
-        ),
-    ])
-    def it_evaluates_equal_subsets_truthily(self, expected, actual):
+    @pytest.mark.parametrize('expected, actual, recursive', tuple(SUBSET_CASES.values()), ids=tuple(SUBSET_CASES))
+    def it_evaluates_equal_subsets_truthily(self, expected, actual, recursive):
         try:
-            assert_dict_is_subset(expected, actual)
+            assert_dict_is_subset(expected, actual, recursive=recursive)
         except AssertionError as e:
             raise AssertionError('dict was unexpectedly not a subset') from e
 
 
-    @pytest.mark.parametrize('expected, actual', [
-        pytest.param(
-            {'key': 'value'},
-            {},
-            id='empty',
-        ),
-        pytest.param(
-            {'key': 'value',
-             'other_key': 'other_value'},
-            {'key': 'value'},
-            id='expected-more',
-        ),
-        pytest.param(
-            {'parent': {'key': 'value',
-                        'other_key': 'other_value'}},
-            {'parent': {'key': 'value'}},
-            id='expected-more-nested',
-        ),
-    ])
-    def it_evaluates_unequal_subsets_falsily(self, expected, actual):
+    @pytest.mark.parametrize('expected, actual, recursive', tuple(NON_SUBSET_CASES.values()), ids=tuple(NON_SUBSET_CASES))
+    def it_evaluates_unequal_subsets_falsily(self, expected, actual, recursive):
         with pytest.raises(AssertionError):
-            assert_dict_is_subset(expected, actual)
+            assert_dict_is_subset(expected, actual, recursive=recursive)
 
             # Assertion above should fail. If not, manually fail it.
             pytest.fail('dict was unexpectedly a subset')
@@ -108,6 +160,14 @@ class DescribeAssertModelAttrs:
             Model(key='value', other_key='other_value'),
             id='strict-superset',
         ),
+        pytest.param(
+            {'key': 'value',
+             'parent': {'key': 'value'}},
+            Model(key='value',
+                  parent={'key': 'value',
+                          'other_key': 'other_value'}),
+            id='nested-strict-superset',
+        ),
     ])
     @pytest.mark.parametrize('as_kwargs', [
         pytest.param(False, id='passing-dict'),
@@ -1,10 +1,11 @@
-from dataclasses import make_dataclass
+import enum
+import re
 from datetime import datetime
 from functools import partial
+from types import MappingProxyType, SimpleNamespace
 from typing import Type, TypeVar
 
 import pytest
-from pytest_lambda import lambda_fixture
 
 from pytest_assert_utils import util
 from pytest_assert_utils.util import decl
@@ -13,7 +14,7 @@ from pytest_assert_utils.util import decl
 class DescribeAny:
 
     def it_compares_true_to_anything_with_no_args(self):
-        example_values = [
+        example_values = (
             1,
             '2',
             3.0,
@@ -22,22 +23,16 @@ class DescribeAny:
             None,
             True,
             False,
-        ]
+        )
 
         any_ = util.Any()
-        inequal_values = [
-            value
-            for value in example_values
-            if any_ != value
-        ]
-
-        assert not inequal_values, \
+        assert all(any_ == value for value in example_values), \
             'Unexpectedly found values which did not compare true to Any()'
 
     @pytest.mark.parametrize('expected,actual', [
         pytest.param(util.Any(int), 1, id='int'),
         pytest.param(util.Any(str), '1', id='str'),
-        pytest.param(util.Any(datetime), datetime.today(), id='datetime'),
+        pytest.param(util.Any(datetime), datetime(2020, 1, 1), id='datetime'),
     ])
     def it_compares_true_to_values_of_same_type(self, expected, actual):
         assert expected == actual
@@ -63,6 +58,28 @@ class DescribeAny:
         assert expected == actual
 
 
+class DescribeOptional:
+
+    @pytest.mark.parametrize('expected,actual', [
+        pytest.param(util.Optional(), None, id='no-value'),
+        pytest.param(util.Optional(24), None, id='value-given-none'),
+        pytest.param(util.Optional(24), 24, id='value-given-value'),
+        pytest.param(util.Optional(util.Any(int)), 24, id='meta-value'),
+    ])
+    def it_compares_true_to_none_or_value(self, expected, actual):
+        assert expected == actual
+
+    @pytest.mark.parametrize('expected,actual', [
+        pytest.param(util.Optional(), 24, id='no-value'),
+        pytest.param(util.Optional(24), 25, id='value'),
+        pytest.param(util.Optional(util.Any(int)), '24', id='meta-value'),
+        pytest.param(util.Optional(24), util.Optional(25), id='other-optional'),
+        pytest.param(util.Optional(24), util.Any(type(None)), id='meta-value-matching-none'),
+    ])
+    def it_compares_false_to_other_values(self, expected, actual):
+        assert expected != actual
+
+
 CHECKER_CLASSES = (
     util.List,
     util.Set,
@@ -70,65 +87,132 @@ CHECKER_CLASSES = (
     util.Str,
 )
 
-CHECKER_COLLECTION_TYPES = {
+CHECKER_COLLECTION_TYPES = MappingProxyType({
     cls: cls.__bases__[1]
     for cls in CHECKER_CLASSES if cls is not util.Collection
-}
+})
+
+ALL_COLLECTION_TYPES = frozenset(CHECKER_COLLECTION_TYPES.values())
+
+COMPATIBLE_COLLECTION_TYPES = MappingProxyType({
+    **{
+        cls: frozenset({collection_type})
+        for cls, collection_type in CHECKER_COLLECTION_TYPES.items()
+    },
+    util.Collection: ALL_COLLECTION_TYPES,
+})
 
 
 _CT = TypeVar('_CT', bound=decl.BaseCollection)
 
 
+#: Builders for collection types which can't simply be constructed from an iterable of items
+COLLECTION_BUILDERS = MappingProxyType({
+    dict: lambda items: {item: item for item in items},
+    str: ''.join,
+})
+
+
 def create_collection_of_type(collection_type: Type[_CT], *items) -> _CT:
-    if issubclass(collection_type, dict):
-        return {item: item for item in items}
-    elif issubclass(collection_type, str):
-        return ''.join(items)
+    build = COLLECTION_BUILDERS.get(collection_type, collection_type)
+    return build(items)
+
+
+#: Functions creating a collection of each checker class's type from the given items
+COLLECTION_FACTORIES = MappingProxyType({
+    cls: partial(create_collection_of_type, cls._collection_type)
+    for cls in CHECKER_CLASSES
+})
+
+
+@pytest.fixture(scope='session', params=CHECKER_CLASSES, ids=lambda cls: cls.__name__)
+def chained_checker(request):
+    """A checker chaining every generative method, along with its repr"""
+    checker_cls = request.param
+    checker = (
+        checker_cls
+            .empty()
+            .not_empty()
+            .containing('uniq1')
+            .containing_only('uniq2')
+            .not_containing('uniq5')
+    )
+    if issubclass(checker_cls, dict):
+        checker = checker.containing_exactly(uniq3='uniq4')
     else:
-        return collection_type(items)
+        checker = checker.containing_exactly('uniq3', 'uniq4')
+
+    return checker, repr(checker)
+
+
+#: Every generative method name and value expected in the repr of chained_checker
+REPR_TOKENS = frozenset({
+    'empty',
+    'not_empty',
+    'containing',
+    'containing_only',
+    'containing_exactly',
+    'not_containing',
+    'uniq1',
+    'uniq2',
+    'uniq3',
+    'uniq4',
+    'uniq5',
+})
+
+# NOTE: longer tokens come first, so e.g. "not_empty" isn't matched as "empty"
+REPR_TOKENS_RE = re.compile('|'.join(map(re.escape, sorted(REPR_TOKENS, key=len, reverse=True))))
+
+
+def generate_items(items):
+    """Return a fresh, single-use generator over items"""
+    return (item for item in items)
+
+
+def parametrize_checker_cls(checker_classes=CHECKER_CLASSES, skip=None):
+    """Parametrize checker_cls, skipping the classes in `skip` (mapped to the reason)"""
+    skip = skip or {}
+    params = [
+        pytest.param(cls, marks=pytest.mark.skip(reason=skip[cls])) if cls in skip else cls
+        for cls in checker_classes
+    ]
+    return pytest.mark.parametrize('checker_cls', params, ids=lambda cls: cls.__name__)
 
 
 class DescribeCollectionValuesChecker:
 
-    checker_cls = lambda_fixture(params=[
-        util.List,
-        util.Set,
-        util.Dict,
-        util.Str,
-    ])
-    collection_type = lambda_fixture(lambda checker_cls: checker_cls._collection_type)
-    create_collection = lambda_fixture(lambda collection_type: partial(create_collection_of_type, collection_type))
+    @pytest.fixture
+    def create_collection(self, checker_cls):
+        return COLLECTION_FACTORIES[checker_cls]
 
 
+    @parametrize_checker_cls(CHECKER_CLASSES + (util.Collection,))
     class CaseType:
-        checker_cls = lambda_fixture(params=CHECKER_CLASSES + (util.Collection,))
 
-        compatible_collection_types = lambda_fixture(
-            lambda checker_cls:
-                set(CHECKER_COLLECTION_TYPES.values())
-                if checker_cls is util.Collection
-                else {CHECKER_COLLECTION_TYPES[checker_cls]}
-        )
+        @pytest.fixture
+        def compatible_collection_types(self, checker_cls):
+            return COMPATIBLE_COLLECTION_TYPES[checker_cls]
 
-        incompatible_collection_types = lambda_fixture(
-            lambda compatible_collection_types:
-                set(CHECKER_COLLECTION_TYPES.values()) - compatible_collection_types)
+        @pytest.fixture
+        def incompatible_collection_types(self, compatible_collection_types):
+            return ALL_COLLECTION_TYPES - compatible_collection_types
 
         def it_compares_true_to_compatible_instances(self, checker_cls, compatible_collection_types):
             checker = checker_cls
 
             expected = compatible_collection_types
-            actual = {cls for cls in CHECKER_COLLECTION_TYPES.values() if checker == cls()}
+            actual = {cls for cls in ALL_COLLECTION_TYPES if checker == cls()}
             assert expected == actual
 
         def it_doesnt_compare_true_to_incompatible_instances(self, checker_cls, incompatible_collection_types):
             checker = checker_cls
 
             expected = incompatible_collection_types
-            actual = {cls for cls in CHECKER_COLLECTION_TYPES.values() if checker != cls()}
+            actual = {cls for cls in ALL_COLLECTION_TYPES if checker != cls()}
             assert expected == actual
 
 
+    @parametrize_checker_cls()
     class DescribeEmpty:
 
         def it_compares_true_to_empty_collection(self, checker_cls, create_collection):
@@ -148,6 +232,7 @@ class DescribeCollectionValuesChecker:
             assert expected != actual
 
 
+    @parametrize_checker_cls()
     class DescribeNotEmpty:
 
         def it_compares_true_to_nonempty_collection(self, checker_cls, create_collection):
@@ -167,6 +252,7 @@ class DescribeCollectionValuesChecker:
             assert expected != actual
 
 
+    @parametrize_checker_cls()
     class DescribeContaining:
 
         def it_compares_true_to_collection_containing_values(self, checker_cls, create_collection):
@@ -175,7 +261,7 @@ class DescribeCollectionValuesChecker:
             assert expected == actual
 
         def it_accepts_values_from_generator(self, checker_cls, create_collection):
-            expected = checker_cls.containing(c for c in 'bc')
+            expected = checker_cls.containing(generate_items('bc'))
             actual = create_collection(*'abcz')
             assert expected == actual
 
@@ -185,6 +271,7 @@ class DescribeCollectionValuesChecker:
             assert expected != actual
 
 
+    @parametrize_checker_cls()
     class DescribeNotContaining:
 
         def it_compares_true_to_collection_not_containing_values(self, checker_cls, create_collection):
@@ -193,7 +280,7 @@ class DescribeCollectionValuesChecker:
             assert expected == actual
 
         def it_accepts_values_from_generator(self, checker_cls, create_collection):
-            expected = checker_cls.not_containing(c for c in 'bd')
+            expected = checker_cls.not_containing(generate_items('bd'))
             actual = create_collection(*'acz')
             assert expected == actual
 
@@ -203,6 +290,7 @@ class DescribeCollectionValuesChecker:
             assert expected != actual
 
 
+    @parametrize_checker_cls()
     class DescribeContainingOnly:
 
         def it_compares_true_to_collection_containing_only_values(self, checker_cls, create_collection):
@@ -211,10 +299,15 @@ class DescribeCollectionValuesChecker:
             assert expected == actual
 
         def it_accepts_values_from_generator(self, checker_cls, create_collection):
-            expected = checker_cls.containing_only(c for c in 'bc')
+            expected = checker_cls.containing_only(generate_items('bc'))
             actual = create_collection(*'bc')
             assert expected == actual
 
+        def it_compares_true_to_collection_matching_meta_values(self, checker_cls, create_collection):
+            expected = checker_cls.containing_only('b', util.Any(str))
+            actual = create_collection(*'abc')
+            assert expected == actual
+
         def it_compares_false_to_collection_containing_extra_values(self, checker_cls, create_collection):
             expected = checker_cls.containing_only('b', 'c')
             actual = create_collection(*'abcz')
@@ -226,6 +319,7 @@ class DescribeCollectionValuesChecker:
             assert expected != actual
 
 
+    @parametrize_checker_cls()
     class DescribeContainingExactly:
 
         def it_compares_true_to_collection_containing_exactly_values(self, checker_cls, create_collection):
@@ -234,7 +328,12 @@ class DescribeCollectionValuesChecker:
             assert expected == actual
 
         def it_accepts_values_from_generator(self, checker_cls, create_collection):
-            expected = checker_cls.containing_exactly(c for c in 'ab')
+            expected = checker_cls.containing_exactly(generate_items('ab'))
+            actual = create_collection(*'ab')
+            assert expected == actual
+
+        def it_compares_true_to_collection_matching_meta_values(self, checker_cls, create_collection):
+            expected = checker_cls.containing_exactly('b', util.Any(str))
             actual = create_collection(*'ab')
             assert expected == actual
 
@@ -248,60 +347,199 @@ class DescribeCollectionValuesChecker:
             actual = create_collection(*'abc')
             assert expected != actual
 
-        def it_compares_false_to_collection_containing_dupe_values(
-            self, checker_cls, create_collection, collection_type
-        ):
-            if issubclass(collection_type, (dict, set)):
-                pytest.xfail('dict and set do not support dupe values')
-
+        def it_compares_false_to_collection_containing_fewer_values(self, checker_cls, create_collection):
             expected = checker_cls.containing_exactly('a', 'b')
-            actual = create_collection(*'aabb')
+            actual = create_collection('a')
             assert expected != actual
 
-        def it_compares_false_to_collection_containing_fewer_values(self, checker_cls, create_collection):
+
+    @parametrize_checker_cls(skip={
+        util.Dict: 'dict does not support dupe values',
+        util.Set: 'set does not support dupe values',
+    })
+    class DescribeContainingExactlyDupeValues:
+
+        def it_compares_false_to_collection_containing_dupe_values(self, checker_cls, create_collection):
             expected = checker_cls.containing_exactly('a', 'b')
-            actual = create_collection('a')
+            actual = create_collection(*'aabb')
             assert expected != actual
 
 
+    @parametrize_checker_cls()
+    class DescribeGenerativeMethods:
+
+        def it_reuses_checkers_with_identical_constraints(self, checker_cls):
+            expected = checker_cls.containing('a').not_empty()
+            actual = checker_cls.containing('a').not_empty()
+            assert expected is actual
+
+        def it_doesnt_reuse_checkers_with_equal_values_of_other_types(self, checker_cls):
+            expected = checker_cls.containing(1)
+            actual = checker_cls.containing(True)
+            assert expected is not actual
+
+        def it_doesnt_reuse_checkers_with_equal_floats_of_differing_sign(self, checker_cls):
+            expected = checker_cls.containing(-0.0)
+            actual = checker_cls.containing(0.0)
+            assert expected is not actual
+
+        def it_doesnt_reuse_checkers_with_loosely_equal_meta_values(self, checker_cls):
+            expected = checker_cls.containing(util.Optional(util.Any()))
+            actual = checker_cls.containing(util.Optional(()))
+            assert expected is not actual
+
+
     class DescribeRepr:
 
-        def it_generates_string_repr_for_all_methods(self, checker_cls):
-            checker = (
-                checker_cls
-                    .empty()
-                    .not_empty()
-                    .containing('uniq1')
-                    .containing_only('uniq2')
-                    .not_containing('uniq5')
-            )
-            if issubclass(checker_cls, dict):
-                checker = checker.containing_exactly(uniq3='uniq4')
-            else:
-                checker = checker.containing_exactly('uniq3', 'uniq4')
+        def it_generates_string_repr_for_all_methods(self, chained_checker):
+            _, checker_repr = chained_checker
 
+            expected = REPR_TOKENS
+            actual = set(REPR_TOKENS_RE.findall(checker_repr))
+            assert actual == expected
+
+        @parametrize_checker_cls()
+        def it_doesnt_reuse_repr_of_parent_checker(self, checker_cls):
+            # NOTE: generated checkers derive from the public class, so its repr
+            #       must be memoized first to catch it leaking into them
+            parent_repr = repr(checker_cls)
+
+            checker = checker_cls.not_containing('uniq1')
             checker_repr = repr(checker)
 
-            expected = {
-                'empty',
-                'not_empty',
-                'containing',
-                'containing_only',
-                'containing_exactly',
-                'not_containing',
-                'uniq1',
-                'uniq2',
-                'uniq3',
-                'uniq4',
-                'uniq5',
-            }
-            actual = {s for s in expected if s in checker_repr}
-            assert actual == expected
+            assert checker_repr != parent_repr
+            assert 'uniq1' in checker_repr
+
+
+class ArrayLike:
+    """A collection with element-wise truthiness, like numpy arrays"""
+
+    def __init__(self, *items):
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __bool__(self):
+        if len(self.items) != 1:
+            raise ValueError('The truth value of an array with more than one element is ambiguous')
+        return bool(self.items[0])
+
+
+class DescribeCollection:
+
+    def it_checks_emptiness_by_length(self):
+        assert util.Collection.empty() == ArrayLike()
+        assert util.Collection.empty() != ArrayLike(0, 1)
+        assert util.Collection.not_empty() == ArrayLike(0)
+
+
+class DescribeList:
+
+    def it_accepts_unhashable_values(self):
+        expected = util.List.containing(['a'])
+        actual = [['a'], ['b']]
+        assert expected == actual
+
+    @pytest.mark.parametrize('expected,actual', [
+        pytest.param(util.List.containing(util.Optional(5), 5), [None], id='containing'),
+        pytest.param(util.List.not_containing(5, util.Optional(5)), [None], id='not_containing'),
+    ])
+    def it_doesnt_drop_meta_values_equal_to_other_values(self, expected, actual):
+        assert expected != actual
+
+    def it_doesnt_confuse_checkers_with_loosely_equal_meta_values(self):
+        loose = util.List.containing(util.Optional(util.Any()))
+        assert loose == [1]
+
+        expected = util.List.containing(util.Optional(()))
+        actual = [1]
+        assert expected != actual
+
+    def it_doesnt_drop_equal_floats_of_differing_sign(self):
+        checker = util.List.containing(0.0, -0.0)
+        assert repr(checker) == 'List.containing(0.0, -0.0)'
+
+    def it_doesnt_drop_meta_values_from_containing_only(self):
+        expected = util.List.containing_only(5, util.Optional(5))
+        actual = [None]
+        assert expected == actual
+
+
+class LowercaseKeysDict(dict):
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+
+class DescribeDict:
+
+    def it_honours_item_lookups_of_dict_subclasses(self):
+        expected = util.Dict.containing(A=1)
+        actual = LowercaseKeysDict(a=1)
+        assert expected == actual
+
+
+class StrictSet(set):
+    """A set which only considers items of the same type as its members to be contained"""
+
+    def __contains__(self, item):
+        return any(type(item) is type(member) and item == member for member in self)
+
+
+class IgnoringCaseSet(util.Set):
+    @classmethod
+    def _collection_contains_(cls, collection, v):
+        return v.lower() in {item.lower() for item in collection}
+
+
+class DescribeSet:
+
+    def it_honours_membership_checks_of_set_subclasses(self):
+        expected = util.Set.containing(1)
+        actual = StrictSet({1.0})
+        assert expected != actual
+
+    def it_honours_overridden_collection_contains_hook(self):
+        actual = {'a'}
+        assert IgnoringCaseSet.containing('A') == actual
+        assert IgnoringCaseSet.not_containing('A') != actual
+
+
+class WholeWordStr(util.Str):
+    @classmethod
+    def _collection_contains_(cls, collection, v):
+        return v in collection.split()
+
+
+class DescribeStr:
+
+    def it_checks_overlapping_substrings(self):
+        checker = util.Str.containing('app', 'apple', 'ples')
+        assert checker == 'apples'
+        assert checker != 'apple'
+        assert checker != 'app ples'
+
+    def it_checks_every_value_with_overridden_collection_contains_hook(self):
+        checker = WholeWordStr.containing('app', 'apple')
+        assert checker == 'app apple'
+        assert checker != 'apple'
+
+
+class Status(enum.Enum):
+    OK = 'ok'
 
 
 def create_object_with_attrs(**attrs):
-    cls = make_dataclass('ExampleObject', attrs.keys())
-    return cls(**attrs)
+    return SimpleNamespace(**attrs)
 
 
 class DescribeModel:
@@ -320,16 +558,20 @@ class DescribeModel:
         actual = create_object_with_attrs(a='alpha')
         assert expected != actual
 
-    class DescribeRepr:
-        def it_includes_attrs_and_values(self):
-            checker = util.Model(uniq1='uniq2', uniq3='uniq4')
-            checker_repr = repr(checker)
+    def it_compares_false_to_object_with_enum_member_for_nested_attr(self):
+        expected = util.Model(status={'code': 1})
+        actual = create_object_with_attrs(status=Status.OK)
+        assert expected != actual
 
-            expected = {
-                'uniq1',
-                'uniq2',
-                'uniq3',
-                'uniq4',
-            }
-            actual = {s for s in expected if s in checker_repr}
-            assert actual == expected
+    def it_includes_attrs_and_values_in_repr(self):
+        checker = util.Model(uniq1='uniq2', uniq3='uniq4')
+        checker_repr = repr(checker)
+
+        expected = {
+            'uniq1',
+            'uniq2',
+            'uniq3',
+            'uniq4',
+        }
+        actual = {s for s in expected if s in checker_repr}
+        assert actual == expected